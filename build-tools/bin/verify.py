@@ -11,25 +11,121 @@
 
 import argparse
 import functools
+import hashlib
+import json
 import logging
 import os
 import pathlib
 import re
+import shutil
 import sys
 import subprocess
 import textwrap
 import typing
 
 
+_logger = logging.getLogger(__name__)
+
+# Only used for the short git describe call: CPython can spawn with posix_spawn instead of fork and exec only when
+# close_fds is False (see _find_executable). The cost is that any inheritable descriptors this process was itself
+# given by its parent (CI runner pipes, a make jobserver, etc.) are passed on to git; descriptors Python opens are
+# non-inheritable anyway (PEP 446). cmake and ctest are long running, gain nothing from this, and keep the default.
+_close_fds = not sys.platform.startswith("linux")
+
+
 # +---------------------------------------------------------------------------+
 # | UTILS
 # +---------------------------------------------------------------------------+
 
 
 @functools.lru_cache
-def _get_version_number(gitdir: pathlib.Path) -> typing.Tuple[int, int, int, str]:
-        git_output = subprocess.run(["git", "describe", "--abbrev=0", "--tags"], cwd=gitdir, capture_output=True, text=True).stdout
-        match_obj = re.match(r"^v(\d+)\.(\d+)\.(\d+)[-_]?(\w*)", git_output)
+def _find_executable(name: str) -> str:
+    """
+    Resolve an executable to its absolute path if it can be found on the PATH. CPython will only spawn
+    children with posix_spawn, rather than fork and exec, when the executable includes a directory.
+    """
+    found = shutil.which(name)
+    return found if found is not None else name
+
+
+# +---------------------------------------------------------------------------+
+
+
+_version_cache_file_name = ".verify_version_cache.json"
+
+# Matches tags like v1.2.3, v1.2.3-beta, or v1.2.3_rc1.
+_version_tag_pattern = re.compile(r"^v(\d+)\.(\d+)\.(\d+)[-_]?(\w*)")
+
+
+def _newest_dir_mtime_ns(path: str) -> int:
+    """
+    A directory's mtime only changes when its direct children do so hierarchical tags (e.g. release/v1.0.0) need
+    every subdirectory to be visited.
+    """
+    newest = os.stat(path).st_mtime_ns
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                newest = max(newest, _newest_dir_mtime_ns(entry.path))
+    return newest
+
+
+def _git_state_key(gitdir: pathlib.Path) -> typing.Optional[str]:
+    """
+    Derive a key from the git metadata that changes whenever the result of git describe might change without
+    having to spawn git itself. Returns None for repository layouts this doesn't understand (e.g. worktrees or
+    submodules where .git is a file).
+    """
+    git_meta_dir = gitdir / ".git"
+    if not git_meta_dir.is_dir():
+        return None
+
+    try:
+        head = (git_meta_dir / "HEAD").read_text().strip()
+        if head.startswith("ref: "):
+            ref_file = git_meta_dir / head[len("ref: "):]
+            if ref_file.is_file():
+                head = ref_file.read_text().strip()
+        # New tags, either loose or packed, are picked up via the mtimes.
+        tags_mtime = _newest_dir_mtime_ns(str(git_meta_dir / "refs" / "tags"))
+        packed_refs = git_meta_dir / "packed-refs"
+        packed_refs_mtime = packed_refs.stat().st_mtime_ns if packed_refs.is_file() else 0
+    except OSError:
+        return None
+
+    return "{}:{}:{}".format(head, tags_mtime, packed_refs_mtime)
+
+
+# +---------------------------------------------------------------------------+
+
+
+@functools.lru_cache
+def _get_version_number(gitdir: pathlib.Path, cache_dir: typing.Optional[pathlib.Path] = None) -> typing.Tuple[int, int, int, str]:
+        """
+        Parse the project version from the most recent git tag. If cache_dir is provided the result is also
+        persisted there so subsequent invocations of this script can skip git describe until the repository
+        state changes.
+        """
+        state_key = _git_state_key(gitdir) if cache_dir is not None else None
+        if cache_dir is not None and state_key is not None:
+            try:
+                cached = json.loads((cache_dir / _version_cache_file_name).read_text())
+                if cached["key"] == state_key:
+                    cached_version = cached["version"]
+                    return (int(cached_version[0]), int(cached_version[1]), int(cached_version[2]), str(cached_version[3]))
+            except (OSError, ValueError, KeyError, IndexError, TypeError):
+                pass
+
+        try:
+            # Use git -C rather than cwd= so subprocess can take its posix_spawn fast path.
+            git_output = subprocess.check_output([_find_executable("git"), "-C", str(gitdir), "describe", "--abbrev=0", "--tags"],
+                                                 stderr=subprocess.DEVNULL,
+                                                 close_fds=_close_fds).decode("ascii", "replace")
+        except subprocess.CalledProcessError:
+            # No tags (or not a git repository).
+            git_output = ""
+
+        match_obj = _version_tag_pattern.match(git_output)
         if match_obj is not None:
             qualifier = match_obj.group(4)
             _version_string = (int(match_obj.group(1)),
@@ -38,6 +134,20 @@ def _get_version_number(gitdir: pathlib.Path) -> typing.Tuple[int, int, int, str
                             qualifier if qualifier else "")
         else:
             _version_string = (0,0,0,"")
+
+        if cache_dir is not None and state_key is not None and cache_dir.is_dir():
+            # Write then rename so a concurrent run never reads a partially written cache.
+            cache_file = cache_dir / _version_cache_file_name
+            temp_file = cache_file.with_name("{}.{}".format(cache_file.name, os.getpid()))
+            try:
+                temp_file.write_text(json.dumps({"key": state_key, "version": _version_string}))
+                os.replace(temp_file, cache_file)
+            except OSError:
+                try:
+                    temp_file.unlink(missing_ok=True)
+                except OSError:
+                    pass
+
         return _version_string
 
 
@@ -45,26 +155,29 @@ def _get_version_number(gitdir: pathlib.Path) -> typing.Tuple[int, int, int, str
 # +---------------------------------------------------------------------------+
 
 
+# Indexed by --verbose count; anything beyond the end uses the last entry.
+_cmake_logging_levels = ("NOTICE", "STATUS", "VERBOSE", "DEBUG", "TRACE")
+
+
 def _to_cmake_logging_level(verbose: int) -> str:
-    if verbose == 1:
-        cmake_logging_level = "STATUS"
-    elif verbose == 2:
-        cmake_logging_level = "VERBOSE"
-    elif verbose == 3:
-        cmake_logging_level = "DEBUG"
-    elif verbose > 3:
-        cmake_logging_level = "TRACE"
-    else:
-        cmake_logging_level = "NOTICE"
+    return _cmake_logging_levels[min(max(verbose, 0), len(_cmake_logging_levels) - 1)]
+
+
+# +---------------------------------------------------------------------------+
+
+# Indexed by --verbose count; anything beyond the end uses the last entry.
+_logging_levels = (logging.WARN, logging.WARN, logging.INFO, logging.DEBUG)
 
-    return cmake_logging_level
+
+def _to_logging_level(verbose: int) -> int:
+    return _logging_levels[min(max(verbose, 0), len(_logging_levels) - 1)]
 
 
 # +---------------------------------------------------------------------------+
 
 
 def _create_build_dir_name(args: argparse.Namespace) -> str:
-    return "{}".format(args.build_dir_name)
+    return args.build_dir_name
 
 
 # +---------------------------------------------------------------------------+
@@ -97,11 +210,49 @@ def _ext_dir(args: argparse.Namespace) -> pathlib.Path:
     return _root_dir(args) / args.ext_dir
 
 
+# +---------------------------------------------------------------------------+
+
+
+def _project_version(args: argparse.Namespace) -> typing.Tuple[int, int, int, str]:
+    """
+    The project version for the current root directory. The version is cached in the build directory
+    unless this is a dry run.
+    """
+    return _get_version_number(_root_dir(args), None if args.dry_run else _build_dir(args))
+
+
 # +---------------------------------------------------------------------------+
 # | ARGPARSE
 # +---------------------------------------------------------------------------+
 
 
+def _positive_int(value: str) -> int:
+    try:
+        as_int = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError("{} is not a positive integer".format(value))
+    if as_int < 1:
+        raise argparse.ArgumentTypeError("{} is not a positive integer".format(value))
+    return as_int
+
+
+# +---------------------------------------------------------------------------+
+
+
+# The unqualified action names, in the order the phases run.
+_action_names = ("clean", "configure", "build", "test", "release")
+
+_qualified_action_pattern = re.compile(
+    r"""
+    ^(?:(?P<prefix>clean)-)?                        # clean first, e.g. clean-test
+    (?P<action>{})
+    (?:-(?P<only>only))?                            # skip the preceding actions, e.g. build-only
+    (?:-+(?P<suffix>\S+))?                          # build target override, e.g. test-only-run_examples
+    """.format("|".join(_action_names)),
+    re.ASCII | re.VERBOSE,
+)
+
+
 class QualifiedAction:
     """
     Used to allow action names that have a qualified suffix like
@@ -110,10 +261,21 @@ class QualifiedAction:
     latter means only the clean action instead of also the clean action.
     """
 
-    ActionPattern = re.compile(r"^(?:(?P<prefix>clean)-)?(?P<action>configure|build|test|release|clean)(?:-(?P<only>only))?(?:-+(?P<suffix>\S+))?")
+    ActionPattern = _qualified_action_pattern
+
+    SimpleActions = frozenset(_action_names)
 
     def __init__(self, input: str):
-        match_obj = self.ActionPattern.match(str(input))
+        input = str(input)
+        if input in self.SimpleActions:
+            # Unqualified action names are the common case and don't need the regex.
+            self._prefix = None
+            self._name = input
+            self._suffix = None
+            self._only = False
+            return
+
+        match_obj = self.ActionPattern.match(input)
         if match_obj is None:
             self._prefix = None
             self._name = ""
@@ -158,10 +320,27 @@ class QualifiedAction:
 # +---------------------------------------------------------------------------+
 
 
+class _DedentHelpFormatter(argparse.RawTextHelpFormatter):
+    """
+    Raw text help formatter that dedents descriptions, epilogs, and help strings when, and only when, the help
+    is actually formatted. This lets the parser be built from the indented literals without paying to dedent
+    them on every run.
+    """
+
+    def _split_lines(self, text: str, width: int) -> typing.List[str]:
+        return super()._split_lines(textwrap.dedent(text), width)
+
+    def _fill_text(self, text: str, width: int, indent: str) -> str:
+        return super()._fill_text(textwrap.dedent(text), width, indent)
+
+
+# +---------------------------------------------------------------------------+
+
+
+@functools.lru_cache(maxsize=1)
 def _make_parser() -> argparse.ArgumentParser:
 
-    prolog =  textwrap.dedent(
-        r"""
+    prolog = r"""
                                           _           _
    ___  _ __   ___ _ __   ___ _   _ _ __ | |__   __ _| |
   / _ \| '_ \ / _ | '_ \ / __| | | | '_ \| '_ \ / _` | |
@@ -171,10 +350,8 @@ def _make_parser() -> argparse.ArgumentParser:
 -----------------------------------------------------------------------------------------
 CMake command-line helper for running verification builds of opencyphal C/C++ projects.
     """
-    )
 
-    epilog = textwrap.dedent(
-        """
+    epilog = """
 
         **Example Usage**::
 
@@ -193,12 +370,11 @@ CMake command-line helper for running verification builds of opencyphal C/C++ pr
 
     ---
     """
-    )
 
     parser = argparse.ArgumentParser(
         description=prolog,
         epilog=epilog,
-        formatter_class=argparse.RawTextHelpFormatter,
+        formatter_class=_DedentHelpFormatter,
     )
 
     # --[COMMON ARGS]--------------------------------------
@@ -207,8 +383,7 @@ CMake command-line helper for running verification builds of opencyphal C/C++ pr
         "--verbose",
         action="count",
         default=0,
-        help=textwrap.dedent(
-            """
+        help="""
         Used to form -DCMAKE_MESSAGE_LOG_LEVEL and other options passed into
         cmake as well as the verbosity of this script.
 
@@ -222,28 +397,26 @@ CMake command-line helper for running verification builds of opencyphal C/C++ pr
              5 : TRACE           : debug + env : --trace --warn-uninitialized
             6+ : TRACE           : debug + env : --trace-expand --warn-uninitialized
 
-    """[1:])
+    """[1:]
     )
 
     parser.add_argument(
         "--version",
         action="store_true",
-        help=textwrap.dedent(
-            """
+        help="""
         Emits the current version.
 
             export CYPHAL_PROJECT_VERSION=$(./verify.py --version)
 
-    """[1:])
+    """[1:]
     )
 
     # --[ACTIONS]------------------------------------------
     action_args = parser.add_argument_group(
         title="Actions",
-        description=textwrap.dedent(
-            """
+        description="""
         Select the actions to take.
-    """[1:])
+    """[1:]
     )
 
     action_args.add_argument(
@@ -251,24 +424,22 @@ CMake command-line helper for running verification builds of opencyphal C/C++ pr
         "--toolchain",
         choices=["gcc", "clang"],
         default="gcc",
-        help=textwrap.dedent(
-            """
+        help="""
 
         Used to form -DCMAKE_TOOLCHAIN_FILE value
 
         This selects the toolchain description to tell Cmake to use.
 
-    """[1:])
+    """[1:]
     )
 
     action_args.add_argument(
         "action",
-        choices=["clean", "configure", "build", "test", "release"],
+        choices=_action_names,
         default="release",
         nargs="?",
         type=typing.cast(typing.Callable[[str], str], QualifiedAction),
-        help=textwrap.dedent(
-            """
+        help="""
 
         BUILD ACTIONS:
         -----------------------------------------------------------------------
@@ -340,16 +511,15 @@ CMake command-line helper for running verification builds of opencyphal C/C++ pr
             ninja -t deps
             ...
         ---
-    """[1:])
+    """[1:]
     )
 
     # --[VARIANTS]-----------------------------------------
     variant_args = parser.add_argument_group(
         title="build variants",
-        description=textwrap.dedent(
-            """
+        description="""
         Arguments that modify build parameters.
-    """[1:])
+    """[1:]
     )
 
     variant_args.add_argument(
@@ -357,8 +527,7 @@ CMake command-line helper for running verification builds of opencyphal C/C++ pr
         "--build-flavor",
         choices=["Debug", "Release", "Coverage"],
         default="Debug",
-        help=textwrap.dedent(
-            """
+        help="""
         Sets -DCMAKE_BUILD_TYPE value
 
         Coverage : builds will be un-optimized and code will be instrumented
@@ -367,36 +536,34 @@ CMake command-line helper for running verification builds of opencyphal C/C++ pr
                    symbols will be included.
         Release  : builds will be reasonably optimized.
 
-    """[1:])
+    """[1:]
     )
 
     variant_args.add_argument(
         "-cda",
         "--asserts",
         action="store_true",
-        help=textwrap.dedent(
-            """
+        help="""
         Enables various debug asserts.
 
           -DCETL_ENABLE_DEBUG_ASSERT:BOOL=ON
           -DLIBCYPHAL_INTROSPECTION_ENABLE_ASSERT:BOOL=ON
           -DLIBCXX_ENABLE_ASSERTIONS:BOOL=ON
 
-    """[1:])
+    """[1:]
     )
 
     variant_args.add_argument(
         "-std",
         "--cpp-standard",
         default="14",
-        help=textwrap.dedent(
-            """
+        help="""
 
         The number part of a valid --std=c++{number} argument.
 
         Sets -DCETLVAST_CPP_STANDARD value
 
-    """[1:])
+    """[1:]
     )
 
     exception_group = variant_args.add_mutually_exclusive_group()
@@ -405,74 +572,78 @@ CMake command-line helper for running verification builds of opencyphal C/C++ pr
         "-exceptions",
         "--exceptions",
         action="store_true",
-        help=textwrap.dedent(
-            """
+        help="""
 
         Compiles C++ with exceptions enabled.
 
-    """[1:])
+    """[1:]
     )
 
     exception_group.add_argument(
         "-no-exceptions",
         "--no-exceptions",
         action="store_true",
-        help=textwrap.dedent(
-            """
+        help="""
 
         Compiles C++ with exceptions disabled.
 
         Sets -DCETLVAST_DISABLE_CPP_EXCEPTIONS:BOOL=ON
 
-    """[1:])
+    """[1:]
     )
 
     # --[ACTION MOD]---------------------------------------
     action_mod_args = parser.add_argument_group(
         title="action modifiers",
-        description=textwrap.dedent(
-            """
+        description="""
         Arguments that change the actions taken by this script.
-    """[1:])
+    """[1:]
     )
 
     action_mod_args.add_argument(
         "--dry-run",
         action="store_true",
-        help=textwrap.dedent(
-            """
+        help="""
         Don't actually do anything. Just log what this script would have done.
         Combine with --verbose to ensure you actually see the script's log
         output.
-    """[1:])
+    """[1:]
     )
 
     action_mod_args.add_argument(
         "-ol",
         "--online",
         action="store_true",
-        help=textwrap.dedent(
-            """
+        help="""
         By default this script assumes no internet access. Specifying --online
         may enable additional steps like checking external dependencies or
         connecting to online linting services, etc.
-    """[1:])
+    """[1:]
+    )
+
+    action_mod_args.add_argument(
+        "-j",
+        "--jobs",
+        type=_positive_int,
+        help="""
+        The maximum number of concurrent processes to use when building. Must be
+        at least 1. If not specified then CMAKE_BUILD_PARALLEL_LEVEL is used when
+        set in the environment, otherwise the number of CPUs on this machine.
+    """[1:]
     )
 
     # --[MISC]---------------------------------------------
     other_args = parser.add_argument_group(
         title="other options",
-        description=textwrap.dedent(
-            """
+        description="""
         Additional stuff you probably can ignore.
-    """[1:])
+    """[1:]
     )
 
     other_args.add_argument(
         "--build-dir-name",
         default="build",
-        help=textwrap.dedent(
-            """
+        help="""
         This script always uses {root-dir}/{build-dir-name} as the name of the
         build directory it creates. This option lets you change the
         {build-dir-name} part of that file name.
@@ -480,7 +651,7 @@ CMake command-line helper for running verification builds of opencyphal C/C++ pr
         See --root-dir argument for changing the root directory.
 
 
-    """[1:])
+    """[1:]
     )
 
     other_args.add_argument(
@@ -488,13 +659,12 @@ CMake command-line helper for running verification builds of opencyphal C/C++ pr
         "--root-dir",
         default=pathlib.Path.cwd(),
         type=pathlib.Path,
-        help=textwrap.dedent(
-            """
+        help="""
         By default this script uses the current-working directory as the
         project root. Use this option to specify a different root directory when
         running the script.
 
-    """[1:])
+    """[1:]
     )
 
     other_args.add_argument(
@@ -502,36 +672,44 @@ CMake command-line helper for running verification builds of opencyphal C/C++ pr
         "--test-suite-dir",
         default=pathlib.Path.cwd(),
         type=pathlib.Path,
-        help=textwrap.dedent(
-            """
+        help="""
         The name of the folder under the root-dir where the verification test suite's
         CMakeLists.txt can be found.
 
-    """[1:])
+    """[1:]
     )
 
     other_args.add_argument(
         "--ext-dir",
         default=pathlib.Path("external"),
         type=pathlib.Path,
-        help=textwrap.dedent(
-            """
+        help="""
         The directory under which external cmake projects will be pulled and
         built.
 
-    """[1:])
+    """[1:]
+    )
+
+    other_args.add_argument(
+        "--dump-env",
+        action="store_true",
+        help="""
+        At --verbose 4 and above, log every environment variable passed to
+        each cmake command. By default only the overrides are listed along with
+        a digest of the inherited environment.
+
+    """[1:]
     )
 
     other_args.add_argument(
         "--dont-force-ninja",
         action="store_true",
-        help=textwrap.dedent(
-            """
+        help="""
 
         -DCMAKE_GENERATOR=Ninja is used by default. Set this to remove the
         preference and allow cmake to pick a default.
 
-    """[1:])
+    """[1:]
     )
 
 
@@ -543,50 +721,71 @@ CMake command-line helper for running verification builds of opencyphal C/C++ pr
 # +---------------------------------------------------------------------------+
 
 
+_cmake_run_banner = textwrap.dedent(
+    """
+    *****************************************************************
+    About to run command: %s
+    in directory        : %s
+    *****************************************************************
+    """
+)
+
+
 def _cmake_run(
     args: argparse.Namespace,
     cmake_args: typing.List[str],
     env: typing.Optional[typing.Dict] = None,
+    is_last: bool = False,
 ) -> int:
     """
     Simple wrapper around cmake execution logic to handle dry-run and verbose logging.
+
+    If is_last is set then nothing is left for this script to do once the command completes so, where supported,
+    this process is replaced by the command instead of spawning it and waiting. In that case this function does not
+    return and the command's exit status becomes the script's exit status.
     """
-    logging.info(
-        textwrap.dedent(
-            """
-    *****************************************************************
-    About to run command: {}
-    in directory        : {}
-    *****************************************************************
-    """
-        ).format(" ".join(cmake_args), str(_build_dir(args)))
-    )
+    build_dir = _build_dir(args)
 
-    copy_of_env: typing.Dict = {}
-    copy_of_env.update(os.environ)
-    if env is not None:
-        copy_of_env.update(env)
+    if _logger.isEnabledFor(logging.INFO):
+        _logger.info(_cmake_run_banner, " ".join(cmake_args), build_dir)
 
-    if args.verbose >= 4:
-        logging.debug("        *****************************************************************")
-        logging.debug("        Using Environment:")
-        for key, value in copy_of_env.items():
-            overridden = key in env if env is not None else False
-            logging.debug("            {} = {}{}".format(key, value, (" (override)" if overridden else "")))
-        logging.debug("        *****************************************************************\n")
+    # With no overrides the child simply inherits our environment; no need to copy it.
+    final_env: typing.Optional[typing.Dict] = None if env is None else {**os.environ, **env}
 
-    if not _build_dir(args).exists():
+    if args.verbose >= 4 and _logger.isEnabledFor(logging.DEBUG):
+        _logger.debug("        *****************************************************************")
+        _logger.debug("        Using Environment:")
+        if args.dump_env:
+            for key, value in (os.environ if final_env is None else final_env).items():
+                overridden = key in env if env is not None else False
+                _logger.debug("            %s = %s%s", key, value, (" (override)" if overridden else ""))
+        else:
+            if env is not None:
+                for key, value in env.items():
+                    _logger.debug("            %s = %s (override)", key, value)
+            inherited_digest = hashlib.sha256(repr(sorted(os.environ.items())).encode("utf-8")).hexdigest()
+            _logger.debug("            <%s inherited variables, sha256=%s>", len(os.environ), inherited_digest)
+        _logger.debug("        *****************************************************************\n")
+
+    if not build_dir.exists():
         if not args.dry_run:
-            logging.error("Build directory {} does not exist. Did you forget to run configure?".format(_build_dir(args)))
+            _logger.error("Build directory %s does not exist. Did you forget to run configure?", build_dir)
             return 1
         else:
             return 0
 
-    if not args.dry_run:
-        return subprocess.run(cmake_args, cwd=_build_dir(args), env=copy_of_env).returncode
-    else:
+    if args.dry_run:
         return 0
 
+    if is_last and os.name == "posix":
+        # exec discards anything still buffered so flush our own output first.
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.chdir(build_dir)
+        os.execvpe(cmake_args[0], cmake_args, os.environ if final_env is None else final_env)
+
+    return subprocess.run(cmake_args, cwd=build_dir, env=final_env).returncode
+
 
 # +---------------------------------------------------------------------------+
 
@@ -596,14 +795,25 @@ def _create_dir_action(args: argparse.Namespace, directory: pathlib.Path) -> int
     Handle all the logic, user input, logging, and file-system operations needed to
     create a directory.
     """
-    if not directory.exists():
-        if not args.dry_run:
-            logging.info("Creating build directory at {}".format(str(directory)))
-            directory.mkdir()
+    if args.dry_run:
+        if not directory.exists():
+            _logger.info("Dry run: Would have created build directory at %s", directory)
         else:
-            logging.info("Dry run: Would have created build directory at {}".format(str(directory)))
-    else:
-        logging.info("Using existing build directory at {}".format(str(directory)))
+            _logger.info("Using existing build directory at %s", directory)
+        return 0
+
+    try:
+        directory.mkdir(parents=True)
+        _logger.info("Created build directory at %s", directory)
+    except FileExistsError:
+        # Only stat the path on this, less common, branch to check it's a directory.
+        if not directory.is_dir():
+            _logger.error("Failed to create build directory at %s: a file with that name exists", directory)
+            return 1
+        _logger.info("Using existing build directory at %s", directory)
+    except OSError as e:
+        _logger.error("Failed to create build directory at %s: %s", directory, e)
+        return 1
 
     return 0
 
@@ -637,28 +847,63 @@ def _create_external_dir_action(args: argparse.Namespace) -> int:
 
 _cmake_configure_cmake_suffix = ".cmake"
 
+# Relative to the test suite directory.
+_cmake_configure_flag_set_file = os.path.join("cmake", "compiler_flag_sets", "default" + _cmake_configure_cmake_suffix)
+
+# Relative to the root directory.
+_cmake_configure_toolchain_dir = os.path.join(".devcontainer", "cmake", "toolchains")
+_cmake_configure_toolchain_files = {
+    "clang": os.path.join(_cmake_configure_toolchain_dir, "clang-native" + _cmake_configure_cmake_suffix),
+    "gcc": os.path.join(_cmake_configure_toolchain_dir, "gcc-native" + _cmake_configure_cmake_suffix),
+}
+
+# Written to the build directory after a successful configure. Holds a digest of the configure arguments.
+_configure_stamp_file_name = ".verify_configure_stamp"
+
 
-def _cmake_configure(args: argparse.Namespace, cmake_args: typing.List[str]) -> int:
+def _configure_stamp_key(cmake_configure_args: typing.List[str]) -> str:
+    return hashlib.sha256("\0".join(cmake_configure_args).encode("utf-8")).hexdigest()
+
+
+# +---------------------------------------------------------------------------+
+
+
+def _is_configure_current(build_dir: pathlib.Path, stamp_key: str) -> bool:
     """
-    Format and execute cmake configure command.
+    True if the last successful configure of build_dir used the arguments that stamp_key was made from and the
+    cmake cache hasn't been touched since.
     """
+    stamp_file = build_dir / _configure_stamp_file_name
+    try:
+        return (stamp_file.read_text() == stamp_key and
+                (build_dir / "CMakeCache.txt").stat().st_mtime_ns <= stamp_file.stat().st_mtime_ns)
+    except OSError:
+        return False
+
 
-    cmake_configure_args = cmake_args.copy()
+# +---------------------------------------------------------------------------+
 
-    # --[VERSION NUMBER]-----------------------------------
-    # set version number from git tag
-    version = _get_version_number(_root_dir(args))
-    version_string = "{}.{}.{}".format(version[0], version[1], version[2])
-    cmake_configure_args.append("-DCYPHAL_PROJECT_VERSION={}".format(version_string))
 
-    if not args.online:
-        # see https://cmake.org/cmake/help/latest/module/FetchContent.html
-        cmake_configure_args.append("-DFETCHCONTENT_FULLY_DISCONNECTED:BOOL=ON")
-    else:
-        cmake_configure_args.append("-DFETCHCONTENT_FULLY_DISCONNECTED:BOOL=OFF")
+def _cmake_configure(args: argparse.Namespace, cmake_args: typing.Sequence[str], is_last: bool = False) -> int:
+    """
+    Format and execute cmake configure command. Unless this is the last action (i.e. configure was
+    asked for explicitly) the command is skipped if the build directory is already configured with the
+    same arguments.
+    """
+
+    version = _project_version(args)
+    test_suite_dir = str(_test_suite_dir(args))
 
-    # --[VERBOSITY]----------------------------------------
-    cmake_configure_args.append("-DCMAKE_MESSAGE_LOG_LEVEL:STRING={}".format(_to_cmake_logging_level(args.verbose)))
+    cmake_configure_args = [
+        *cmake_args,
+        # --[VERSION NUMBER]-----------------------------------
+        # set version number from git tag
+        "-DCYPHAL_PROJECT_VERSION={}.{}.{}".format(version[0], version[1], version[2]),
+        # see https://cmake.org/cmake/help/latest/module/FetchContent.html
+        "-DFETCHCONTENT_FULLY_DISCONNECTED:BOOL={}".format("OFF" if args.online else "ON"),
+        # --[VERBOSITY]----------------------------------------
+        "-DCMAKE_MESSAGE_LOG_LEVEL:STRING={}".format(_to_cmake_logging_level(args.verbose)),
+    ]
 
     if args.verbose >= 1:
         cmake_configure_args.append("--warn-uninitialized")
@@ -673,27 +918,23 @@ def _cmake_configure(args: argparse.Namespace, cmake_args: typing.List[str]) ->
         cmake_configure_args.append("-DNO_STATIC_ANALYSIS:BOOL=ON")
 
     # --[COMPILER FLAGS]-----------------------------------
-    flag_set_dir = _test_suite_dir(args) / pathlib.Path("cmake") / pathlib.Path("compiler_flag_sets")
-    flag_set_file = (flag_set_dir / pathlib.Path("default")).with_suffix(_cmake_configure_cmake_suffix)
-
-    cmake_configure_args.append("-DCETLVAST_FLAG_SET={}".format(str(flag_set_file)))
-    cmake_configure_args.append("-DCETLVAST_CPP_STANDARD={}".format(args.cpp_standard))
+    cmake_configure_args += [
+        "-DCETLVAST_FLAG_SET={}".format(os.path.join(test_suite_dir, _cmake_configure_flag_set_file)),
+        "-DCETLVAST_CPP_STANDARD={}".format(args.cpp_standard),
+    ]
 
     # --[TOOL CHAIN]---------------------------------------
     if args.toolchain != "none":
-        toolchain = _root_dir(args) / pathlib.Path(".devcontainer") / pathlib.Path("cmake") / pathlib.Path("toolchains")
-        if args.toolchain == "clang":
-            toolchain_file = toolchain / pathlib.Path("clang-native").with_suffix(_cmake_configure_cmake_suffix)
-        else:
-            toolchain_file = toolchain / pathlib.Path("gcc-native").with_suffix(_cmake_configure_cmake_suffix)
-
-        cmake_configure_args.append("-DCMAKE_TOOLCHAIN_FILE={}".format(str(toolchain_file)))
+        toolchain_file = _cmake_configure_toolchain_files.get(args.toolchain, _cmake_configure_toolchain_files["gcc"])
+        cmake_configure_args.append("-DCMAKE_TOOLCHAIN_FILE={}".format(os.path.join(str(_root_dir(args)), toolchain_file)))
 
     # --[DEBUG ASSERTIONS]---------------------------------
     if args.asserts:
-        cmake_configure_args.append("-DCETL_ENABLE_DEBUG_ASSERT:BOOL=ON")
-        cmake_configure_args.append("-DLIBCYPHAL_INTROSPECTION_ENABLE_ASSERT:BOOL=ON")
-        cmake_configure_args.append("-DLIBCXX_ENABLE_ASSERTIONS:BOOL=ON")
+        cmake_configure_args += [
+            "-DCETL_ENABLE_DEBUG_ASSERT:BOOL=ON",
+            "-DLIBCYPHAL_INTROSPECTION_ENABLE_ASSERT:BOOL=ON",
+            "-DLIBCXX_ENABLE_ASSERTIONS:BOOL=ON",
+        ]
 
     # --[EXCEPTIONS]---------------------------------------
     if args.no_exceptions:
@@ -704,34 +945,69 @@ def _cmake_configure(args: argparse.Namespace, cmake_args: typing.List[str]) ->
         cmake_configure_args.append("-DCMAKE_GENERATOR=Ninja")
 
     # --[CMAKE IS GO!]-------------------------------------
-    cmake_configure_args.append(str(_test_suite_dir(args)))
+    cmake_configure_args.append(test_suite_dir)
+
+    # When configure is only a step towards building there is nothing to do if the build directory was already
+    # configured with exactly these arguments. An explicit configure action always runs.
+    build_dir = _build_dir(args)
+    stamp_key = _configure_stamp_key(cmake_configure_args)
+    if not is_last and _is_configure_current(build_dir, stamp_key):
+        _logger.info("Build directory %s is already configured with these arguments. Skipping configure.", build_dir)
+        return 0
+
+    stamp_file = build_dir / _configure_stamp_file_name
+    if not args.dry_run:
+        stamp_file.unlink(missing_ok=True)
+
+    # Not run with is_last since the stamp has to be written after cmake succeeds.
+    result = _cmake_run(args, cmake_configure_args)
+    if result == 0 and not args.dry_run:
+        stamp_file.write_text(stamp_key)
 
-    return _cmake_run(args, cmake_configure_args)
+    return result
 
 
 # +---------------------------------------------------------------------------+
 
 
-def _cmake_build(args: argparse.Namespace, cmake_args: typing.List[str], build_target: typing.Optional[str] = None) -> int:
+def _cmake_build(args: argparse.Namespace,
+                 cmake_args: typing.Sequence[str],
+                 build_target: typing.Optional[str] = None,
+                 clean_first: bool = False,
+                 is_last: bool = False) -> int:
     """
     Format and execute cmake build command. This method assumes that the build directory
-    is already properly configured.
+    is already properly configured. If clean_first is set then the build directory is cleaned
+    by the same cmake invocation before building.
     """
 
     if build_target is None:
         build_target = "build"
 
-    cmake_build_args = cmake_args.copy()
+    cmake_build_args = [*cmake_args, "--build", str(_build_dir(args)), "--target", build_target]
 
-    cmake_build_args += ["--build", str(_build_dir(args)), "--target", build_target]
+    if clean_first:
+        cmake_build_args.append("--clean-first")
 
-    return _cmake_run(args, cmake_build_args)
+    if args.jobs is not None:
+        cmake_build_args += ["--parallel", str(args.jobs)]
+    elif "CMAKE_BUILD_PARALLEL_LEVEL" in os.environ:
+        cmake_build_args.append("--parallel")
+    else:
+        # A bare --parallel becomes an unbounded make -j with the Makefile generators.
+        cmake_build_args += ["--parallel", str(os.cpu_count() or 1)]
+
+    return _cmake_run(args, cmake_build_args, is_last=is_last)
 
 
 # +---------------------------------------------------------------------------+
 
 
-def _cmake_test(args: argparse.Namespace, cmake_args: typing.List[str], test_target: typing.Optional[str] = None) -> int:
+def _cmake_test(args: argparse.Namespace,
+                cmake_args: typing.Sequence[str],
+                test_target: typing.Optional[str] = None,
+                clean_first: bool = False,
+                is_last: bool = False) -> int:
     """
     Format and execute cmake test command. This method assumes that the build directory
     is already properly configured.
@@ -739,56 +1015,58 @@ def _cmake_test(args: argparse.Namespace, cmake_args: typing.List[str], test_tar
     if test_target is None:
         test_target = "unittest"
 
-    return _cmake_build(args, cmake_args, test_target)
+    return _cmake_build(args, cmake_args, test_target, clean_first, is_last)
 
 
 # +---------------------------------------------------------------------------+
 
 
-def _cmake_release(args: argparse.Namespace, cmake_args: typing.List[str]) -> int:
+def _cmake_release(args: argparse.Namespace, cmake_args: typing.Sequence[str], clean_first: bool = False) -> int:
     """
     Format and execute cmake release command. This method assumes that build step has already completed
     successfully.
     """
-    return _cmake_build(args, cmake_args, "release")
+    return _cmake_build(args, cmake_args, "release", clean_first)
 
 
 # +---------------------------------------------------------------------------+
 
 
-def _cmake_install(args: argparse.Namespace, cmake_args: typing.List[str]) -> int:
+def _cmake_install(args: argparse.Namespace, cmake_args: typing.Sequence[str], is_last: bool = False) -> int:
     """
     Format and execute cmake install command. This method assumes that build step has already completed
     successfully.
     """
-    return _cmake_build(args, cmake_args, "install")
+    return _cmake_build(args, cmake_args, "install", is_last=is_last)
 
 
 # +---------------------------------------------------------------------------+
 
 
-def _cmake_clean(args: argparse.Namespace, cmake_args: typing.List[str]) -> int:
+def _cmake_clean(args: argparse.Namespace, cmake_args: typing.Sequence[str], is_last: bool = False) -> int:
     """
     Format and execute cmake clean command. This method assumes that the configure step has already completed
     successfully.
     """
-    if not _build_dir(args).exists():
-       logging.info("Build directory {} does not exist. Nothing to clean.".format(_build_dir(args)))
+    build_dir = _build_dir(args)
+    if not build_dir.exists():
+       _logger.info("Build directory %s does not exist. Nothing to clean.", build_dir)
        return 0
 
-    return _cmake_build(args, cmake_args, "clean")
+    return _cmake_build(args, cmake_args, "clean", is_last=is_last)
 
 
 # +---------------------------------------------------------------------------+
 
 
-def _cmake_ctest(args: argparse.Namespace, _: typing.List[str]) -> int:
+def _cmake_ctest(args: argparse.Namespace, _: typing.Sequence[str]) -> int:
     """
     run ctest
     """
     # we use ctest to run the compile tests so we take a different
     # branch here.
-    compile_suite_dir = _build_dir(args) / pathlib.Path("compile")
+    build_dir = _build_dir(args)
+    compile_suite_dir = build_dir / "compile"
     report_path = compile_suite_dir / "ctest.xml"
     ctest_run = ["ctest"
                  , "-DCTEST_FULL_OUTPUT"
@@ -798,116 +1076,143 @@ def _cmake_ctest(args: argparse.Namespace, _: typing.List[str]) -> int:
                  , "--test-dir"
                  , str(compile_suite_dir)]
     if not args.dry_run:
-        logging.debug("about to run {}".format(str(ctest_run)))
-        return subprocess.run(ctest_run, cwd=_build_dir(args)).returncode
+        _logger.debug("about to run %s", ctest_run)
+        return subprocess.run(ctest_run, cwd=build_dir).returncode
     else:
-        logging.info("Is dry-run. Would have run ctest: {}".format(str(ctest_run)))
+        _logger.info("Is dry-run. Would have run ctest: %s", ctest_run)
         return 0
 
 
 # +---------------------------------------------------------------------------+
-# | COMMAND-LINE INTERFACE
+# | PHASES
 # +---------------------------------------------------------------------------+
 
 
-def cli() -> int:
+def _configure_phase(args: argparse.Namespace, cmake_args: typing.Sequence[str], is_last: bool, _: bool) -> int:
     """
-    Main method to execute when this package/script is invoked as a command.
+    Create the build and external directories then configure the cmake build. Configure never
+    cleans so the clean_first argument is ignored.
     """
-    args = _make_parser().parse_args()
+    result = _create_build_dir_action(args)
+    if result != 0:
+        return result
 
-    cmake_args = ["cmake"]
+    result = _create_external_dir_action(args)
+    if result != 0:
+        return result
 
-    logging_level = logging.WARN
+    return _cmake_configure(args, cmake_args, is_last)
 
-    if args.verbose == 2:
-        logging_level = logging.INFO
-    elif args.verbose >= 3:
-        logging_level = logging.DEBUG
 
-    logging.basicConfig(format="%(levelname)s: %(message)s", level=logging_level)
+# +---------------------------------------------------------------------------+
 
-    logging.info(
-        textwrap.dedent(
-            """
 
-    *****************************************************************
-    Command-line Arguments to {} for build folder {}:
+def _build_phase(args: argparse.Namespace, cmake_args: typing.Sequence[str], is_last: bool, clean_first: bool) -> int:
+    """
+    Build the action's suffix target or the default build target.
+    """
+    return _cmake_build(args, cmake_args, args.action.suffix, clean_first, is_last)
 
-    {}
 
-    For verify version {}
-    *****************************************************************
+# +---------------------------------------------------------------------------+
 
+
+def _test_phase(args: argparse.Namespace, cmake_args: typing.Sequence[str], is_last: bool, clean_first: bool) -> int:
     """
-        ).format(os.path.basename(__file__), str(_build_dir(args)), str(args), _get_version_number(_root_dir(args)))
-    )
+    Build the action's suffix target or the default test target.
+    """
+    return _cmake_test(args, cmake_args, args.action.suffix, clean_first, is_last)
 
-    # --[CLEAN]----------------------------------------------------------------
-    if args.action == "clean" or args.action.prefix == "clean":
-        _cmake_clean(args, cmake_args)
 
-    if args.action == "clean":
-            return 0
+# +---------------------------------------------------------------------------+
 
-    # --[CONFIGURE]------------------------------------------------------------
-    if args.action.only and args.action != "configure":
-        logging.debug("{}-only specified. Skipping configure step.".format(str(args.action)))
 
-    else:
-        result = _create_build_dir_action(args)
-        if result != 0:
-            return result
+def _release_phase(args: argparse.Namespace, cmake_args: typing.Sequence[str], is_last: bool, clean_first: bool) -> int:
+    """
+    Package and then install the build artifacts.
+    """
+    result = _cmake_release(args, cmake_args, clean_first)
+    if result != 0:
+        return result
 
-        result = _create_external_dir_action(args)
-        if result != 0:
-            return result
+    return _cmake_install(args, cmake_args, is_last)
 
-        result = _cmake_configure(args, cmake_args)
-        if result != 0:
-            return result
 
-        if args.action == "configure":
-            return 0
+# +---------------------------------------------------------------------------+
 
-    # --[BUILD]----------------------------------------------------------------
-    if args.action.only and args.action != "build":
-        logging.debug("{}-only specified. Skipping build step.".format(str(args.action)))
+_phases: typing.Tuple[typing.Tuple[str, typing.Callable[[argparse.Namespace, typing.Sequence[str], bool, bool], int]], ...] = (
+    ("configure", _configure_phase),
+    ("build", _build_phase),
+    ("test", _test_phase),
+    ("release", _release_phase),
+)
 
-    else:
-        result = _cmake_build(args, cmake_args, args.action.suffix)
-        if result != 0:
-            return result
 
-        if args.action == "build":
-            return 0
+# +---------------------------------------------------------------------------+
+# | COMMAND-LINE INTERFACE
+# +---------------------------------------------------------------------------+
 
-    # --[TEST]-----------------------------------------------------------------
-    if args.action.only and args.action != "test":
-        logging.debug("{}-only specified. Skipping test step.".format(str(args.action)))
 
-    else:
+_cli_banner = textwrap.dedent(
+    """
 
-        result = _cmake_test(args, cmake_args, args.action.suffix)
-        if result != 0:
-            return result
+    *****************************************************************
+    Command-line Arguments to %s for build folder %s:
 
-        if args.action == "test":
-            return 0
+    %s
 
-    # --[RELEASE]--------------------------------------------------------------
-    if args.action.only and args.action != "release":
-        logging.debug("{}-only specified. Skipping release step.".format(str(args.action)))
+    For verify version %s
+    *****************************************************************
 
-    else:
-        result = _cmake_release(args, cmake_args)
-        if result != 0:
-            return result
+    """
+)
+
+
+def cli() -> int:
+    """
+    Main method to execute when this package/script is invoked as a command.
+    """
+    args = _make_parser().parse_args()
+
+    # Shared, unmodified, by every cmake invocation. Each stage builds its own command line from it.
+    cmake_args = ("cmake",)
+
+    logging.basicConfig(format="%(levelname)s: %(message)s", level=_to_logging_level(args.verbose))
 
-        result = _cmake_install(args, cmake_args)
+    if _logger.isEnabledFor(logging.INFO):
+        _logger.info(_cli_banner, os.path.basename(__file__), str(_build_dir(args)), args, _project_version(args))
+
+    action = args.action
+
+    # --[CLEAN]----------------------------------------------------------------
+    # For clean-build, clean-test, etc. the clean is folded into the first cmake --build
+    # as --clean-first rather than costing a cmake invocation of its own.
+    clean_first = action.prefix == "clean" and action != "configure"
+
+    if action == "clean":
+        # Exec'd on POSIX so report the result the same way everywhere.
+        return _cmake_clean(args, cmake_args, is_last=True)
+
+    if action.prefix == "clean" and not clean_first:
+        _cmake_clean(args, cmake_args)
+
+    # --[PHASES]---------------------------------------------------------------
+    for phase_name, phase in _phases:
+        if action.only and action != phase_name:
+            _logger.debug("%s-only specified. Skipping %s step.", action, phase_name)
+            continue
+
+        # The phase named by the action is always the last one run.
+        result = phase(args, cmake_args, action == phase_name, clean_first)
         if result != 0:
             return result
 
+        if phase_name != "configure":
+            clean_first = False
+
+        if action == phase_name:
+            return 0
+
     return 0
 
 